@@ -0,0 +1,85 @@
+"""
+Compare the per-request latency of the render server with cold rendering.
+
+    $ python benchmarks/bench_server.py [-n REQUESTS]
+
+Measured variants:
+    cold process - a new Python process imports tempearly, loads and renders the template,
+    cold in-process - a new Template is loaded from the file and rendered (tempearly already imported),
+    server - the template is rendered by the render server, over one client connection.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from tempearly import Template  # noqa: E402
+from tempearly.server import RenderClient  # noqa: E402
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "templates")
+TEMPLATE = "reddit.html"
+COLD_PROCESS = (
+    "from tempearly import Template; "
+    f"Template.from_file({os.path.join(TEMPLATE_DIR, TEMPLATE)!r}).render()"
+)
+
+
+def measure(func, n):
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"{name:<16} mean {statistics.mean(timings):8.3f} ms   median {statistics.median(timings):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", type=int, default=50, help="the number of requests per variant")
+    args = parser.parse_args()
+
+    root = os.path.join(os.path.dirname(__file__), os.pardir)
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(root))
+
+    report("cold process", measure(lambda: subprocess.run([sys.executable, "-c", COLD_PROCESS], check=True, env=env), args.n))
+    report("cold in-process", measure(lambda: Template.from_file(os.path.join(TEMPLATE_DIR, TEMPLATE)).render(), args.n))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tempearly.sock")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "tempearly", "serve", "--templates", TEMPLATE_DIR, "--socket", path],
+            env=env,
+        )
+        try:
+            with RenderClient(path) as client:
+                # The server is ready once it accepts connections (the socket file exists earlier).
+                deadline = time.monotonic() + 10
+                while True:
+                    try:
+                        client.connect()
+                        break
+                    except (FileNotFoundError, ConnectionRefusedError):
+                        if time.monotonic() > deadline:
+                            raise RuntimeError("the render server did not start")
+                        time.sleep(0.01)
+                client.render(TEMPLATE)
+                report("server", measure(lambda: client.render(TEMPLATE), args.n))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,9 @@
 from .base import (
 	Template,
+)
+from .budget import (
+	Budget,
+)
+from .context import (
+	Lazy,
 )
\ No newline at end of file
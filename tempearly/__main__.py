@@ -0,0 +1,43 @@
+"""
+Command line interface.
+
+    $ python -m tempearly serve --templates DIR --socket PATH [--minify] [--max-output N] [--timeout SECONDS]
+
+Starts the render server (see the `tempearly.server` module).
+"""
+import argparse
+import sys
+
+from .budget import Budget
+from .server import RenderServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tempearly")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="preload templates and render them on requests sent over a Unix socket")
+    serve.add_argument("--templates", required=True, help="the directory with template files")
+    serve.add_argument("--socket", required=True, help="the path of the Unix socket to listen on")
+    serve.add_argument("--minify", action="store_true", help="minify whitespace in templates")
+    serve.add_argument("--max-output", type=int, help="the maximum length of a rendered template (in characters)")
+    serve.add_argument("--timeout", type=float, help="the maximum time of a single render (in seconds)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        budget = None
+        if args.max_output is not None or args.timeout is not None:
+            budget = Budget(max_output=args.max_output, timeout=args.timeout)
+        server = RenderServer(args.templates, minify=args.minify, budget=budget)
+        server.load()
+        for name, error in server.errors.items():
+            print(f"skipped the template `{name}`: {error}", file=sys.stderr)
+        try:
+            server.serve(args.socket)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,11 @@ Its features and API:
     The Template.from_file() method works just like the method from_string() with the exception that the source 
     template string is read from the file on the disk.
 
-    The Template.render() method renders a provided template string with the use of the context dictionary.
+    The Template.render() method renders a provided template string with the use of the context dictionary,
+    optionally within the limits of a Budget (see the `tempearly.budget` module).
+
+    The Template.render_columns() method renders a template string once per row of a columnar
+    dataset (see the `tempearly.columnar` module).
 
 The Token class:
 The Token class represents template tokens that can be of several types:
@@ -23,13 +27,19 @@ The Token class represents template tokens that can be of several types:
         - if expression
         - for loop
 """
+import ast
 from collections import deque
+from collections.abc import Mapping
 import datetime
+import operator
 import re
 
 from .exceptions import TemplateSyntaxError, TemplateKeyError
-from .defaults import DEFAULT_VARIABLE_REGISTRY, DEFAULT_FUNCTION_REGISTRY
+from .defaults import DEFAULT_VARIABLE_REGISTRY, DEFAULT_FUNCTION_REGISTRY, PURE_FUNCTIONS
 from .conditions import Condition
+from .context import Context, Lazy
+from .columnar import CHUNK_SIZE, render_columns
+from .minify import minify
 
 
 VARIABLE_TAG_START = "<<"
@@ -37,10 +47,18 @@ VARIABLE_TAG_END = ">>"
 BLOCK_TAG_START = "<%"
 BLOCK_TAG_END = "%>"
 
+# Types of values for which results of pure functions are memoized during a render.
+MEMOIZED_TYPES = (str, int, bytes)
+
 tags_re = re.compile(r"({}.*?{}|{}.*?{})".format(
     re.escape(VARIABLE_TAG_START), re.escape(VARIABLE_TAG_END),
     re.escape(BLOCK_TAG_START), re.escape(BLOCK_TAG_END),
 ))
+# A function (filter) name is one to two letters, optionally followed by arguments: digits or a parenthesized
+# list (quoted arguments may contain any characters, except for their own quotes).
+FILTER_ARGS = r"""\d+|\((?:'[^']*'|"[^"]*"|[^'"()])*\)"""
+filter_re = re.compile(r"([^\W\d]{{1,2}})({})?".format(FILTER_ARGS))
+pipeline_re = re.compile(r"({0}(?:\|{0})*)\s+[\w\W]".format(r"[^\W\d]{{1,2}}(?:{})?".format(FILTER_ARGS)))
 
 
 def create_exception(message, token=None, exception_class=TemplateSyntaxError):
@@ -56,23 +74,133 @@ def create_exception(message, token=None, exception_class=TemplateSyntaxError):
     return exception_class(message, token=token)
 
 
+class Literal(str):
+    """A literal part of a template string, `line_no` is the line at which it starts."""
+
+    def __new__(cls, value, line_no):
+        literal = super().__new__(cls, value)
+        literal.line_no = line_no
+        return literal
+
+
+def render_tokens(tokens, context):
+    """Render a list of strings, Token and Block objects, return the joined string.
+
+    When the render is limited by a Budget, every rendered part is accounted by its tracker.
+    """
+    tracker = getattr(context, "tracker", None)
+    if tracker is None:
+        return "".join([t if isinstance(t, str) else str(t.render(context)) for t in tokens])
+
+    parts = []
+    for t in tokens:
+        if isinstance(t, Block):
+            # Blocks account their own contents.
+            parts.append(t.render(context))
+            continue
+        if isinstance(t, Token):
+            tracker.line_no = t.line_no
+            value = str(t.render(context))
+            tracker.emit(value, t)
+        else:
+            tracker.line_no = getattr(t, "line_no", tracker.line_no)
+            value = str(t)
+            tracker.emit(value, literal=True)
+        parts.append(value)
+    return "".join(parts)
+
+
+def parse_pipeline(spec):
+    """Parse the chain of functions, e.g., `SU|TR|LJ(20, '|')`, return a list of (name, arguments) tuples.
+
+    Raises the ValueError exception for incorrect chains and arguments.
+    """
+    steps = []
+    position = 0
+    while True:
+        match = filter_re.match(spec, position)
+        if match is None:
+            raise ValueError(f"incorrect function chain `{spec}`")
+        name, args = match.groups()
+        if not args:
+            args = ()
+        elif args.isdigit():
+            args = (int(args),)
+        else:
+            try:
+                args = ast.literal_eval(f"({args[1:-1]},)")
+            except (SyntaxError, ValueError):
+                raise ValueError(f"incorrect arguments of the function `{name}`")
+        steps.append((name, args))
+
+        position = match.end()
+        if position == len(spec):
+            return steps
+        if spec[position] != "|":
+            raise ValueError(f"incorrect function chain `{spec}`")
+        position += 1
+
+
+def compile_pipeline(steps, funcs, pure_funcs):
+    """Compile parsed (name, arguments) steps of a function chain into a single callable.
+
+    `pure_funcs` is a set of names of pure functions. The returned callable has the `pure` attribute,
+    True when all chained functions are pure.
+    """
+    pure = all(name in pure_funcs for name, _ in steps)
+    steps = [(funcs[name], args) for name, args in steps]
+    if len(steps) == 1:
+        func, args = steps[0]
+
+        def pipeline(value):
+            return func(value, *args)
+    else:
+        steps = tuple(steps)
+
+        def pipeline(value):
+            for func, args in steps:
+                value = func(value, *args)
+            return value
+
+    pipeline.pure = pure
+    return pipeline
+
+
+def compile_accessor(name):
+    """Compile a single part of a dotted variable path into an accessor function.
+
+    Numeric parts (e.g., `items.0`) are list indexes. Other parts are looked up as
+    keys of mappings, and as attributes of any other object.
+    """
+    if name.isdigit():
+        return operator.itemgetter(int(name))
+
+    get_item = operator.itemgetter(name)
+    get_attr = operator.attrgetter(name)
+
+    def accessor(obj):
+        if isinstance(obj, Mapping):
+            return get_item(obj)
+        return get_attr(obj)
+    return accessor
+
+
 class Template():
-    def __init__(self, template, context):
-        """Represents a template string."""
+    def __init__(self, template, context, minify=False):
+        """Represents a template string.
+
+        When `minify` is True, literal parts of the template are minified once, when
+        the template is compiled (see the `tempearly.minify` module); `self.minify_report`
+        then holds the byte reduction.
+        """
         self.template = template
         self.context = context
+        self.minify = minify
+        self.minify_report = None
+        # Names of lazy context values computed during the last render.
+        self.forced = set()
         self.tokens = []
 
-    def process_token(self, token):
-        """Process a token and return rendered value.
-
-        A token can be either string literal or Token instance,
-        detect which one and process it accordingly.
-        """
-        if isinstance(token, Token) or isinstance(token, Block):
-            return str(token.render(self.context))
-        return str(token)
-
     def tokenize(self):
         """Generate a token list from the input string.
         
@@ -119,7 +247,14 @@ class Template():
                     if len(blocks) == 0:
                         tokens.append(block)
                         block = None
-                        continue
+                    else:
+                        # A nested block, continue with the enclosing one.
+                        blocks[-1].append_token(block)
+                        block = blocks[-1]
+                    continue
+
+            if isinstance(token, str):
+                token = Literal(token, prev_line_no)
 
             if block:
                 block.append_token(token)
@@ -127,14 +262,55 @@ class Template():
                 tokens.append(token)
         return tokens
 
-    def render(self):
-        """Render a template string."""
-        self.tokens = self.tokenize()
+    def compile(self):
+        """Tokenize (and optionally minify) the template string once, return the token list.
 
-        return "".join([self.process_token(t) for t in self.tokens])
+        Subsequent calls return the already compiled `self.tokens`.
+        """
+        if not self.tokens:
+            tokens = self.tokenize()
+            if self.minify:
+                tokens, self.minify_report = minify(tokens)
+            self.tokens = tokens
+        return self.tokens
+
+    def render(self, budget=None, context=None):
+        """Render a template string.
+
+        `budget` is a Budget object limiting the render (no limits by default).
+
+        `context` is a dictionary used instead of the Template's context for this render only,
+        so a compiled template can be rendered with many contexts.
+        """
+        self.compile()
+        if context is None:
+            context = self.context
+        context = Context(context, tracker=budget.start() if budget else None)
+
+        try:
+            return render_tokens(self.tokens, context)
+        finally:
+            self.forced = set(context.forced)
+
+    def render_columns(self, columns, chunk_size=CHUNK_SIZE):
+        """Render a template string once per row of the columnar dataset, yield rendered rows.
+
+        Arguments:
+
+        `columns` is a dictionary mapping variable names to equally long sequences of values,
+        e.g., lists or NumPy arrays (see `tempearly.columnar.columns_from_csv()` for CSV files)
+
+        `chunk_size` is the number of rows evaluated at once
+
+        Sample:
+        >>> Template.from_string("Hi <<name>>").render_columns({"name": ["john", "jane"]})
+        """
+        self.compile()
+
+        return render_columns(self.tokens, columns, chunk_size=chunk_size)
 
     @classmethod
-    def from_string(cls, template, context=None):
+    def from_string(cls, template, context=None, minify=False):
         """Instantiate the Template class from a string.
 
         Arguments:
@@ -142,15 +318,17 @@ class Template():
         `context` is a dictionary containing variables to use when rendering the template
         (by default it is an empty dictionary)
 
+        `minify` enables the whitespace minification of the template (False by default)
+
         Sample:
         >>> Template.from_string(template_string, {'variable': 'value'})
         """
         if not context:
             context = {}
-        return cls(template, context)
+        return cls(template, context, minify=minify)
 
     @classmethod
-    def from_file(cls, file_name, context=None):
+    def from_file(cls, file_name, context=None, minify=False):
         """Instantiate the Template class with a template string from the file.
 
         Please be conscious that this method will load the entire file into the computer memory.
@@ -165,9 +343,11 @@ class Template():
 
         `context` is a dictionary containing variables to use when rendering the template
         (by default it is an empty dictionary)
+
+        `minify` enables the whitespace minification of the template (False by default)
         """
         with open(file_name, encoding="utf") as fh:
-            return cls.from_string(fh.read(), context=context)
+            return cls.from_string(fh.read(), context=context, minify=minify)
 
 
 class Token:
@@ -180,6 +360,13 @@ class Token:
     VARIABLE - represents a variable token, for example, `<<VAR>>` string would translate
     into a Token instance with a VARIABLE type. Variable tags inside template strings must be defined in a
     single line.
+
+    Variable names can be dotted paths, e.g., `<<user.address.city>>`. The path is compiled once
+    into a chain of accessors, and resolved prefixes are memoized for the rest of the render.
+
+    Variables and strings can be passed through a chain of functions, e.g., `<<SU|TR|LJ20 name>>`.
+    The chain is compiled once into a single callable (shared by all tokens with the same chain).
+    Chains of pure functions are computed once for strings, and once per distinct value during a render.
     """
 
     # The default attribute, for now, is the dictionary
@@ -187,6 +374,10 @@ class Token:
     defaults = DEFAULT_VARIABLE_REGISTRY
     # Default functions.
     funcs = DEFAULT_FUNCTION_REGISTRY
+    # Names of default functions that are pure.
+    pure_funcs = PURE_FUNCTIONS
+    # Compiled function chains by their specification, e.g., `SU|TR`, and the chained functions.
+    pipelines = {}
 
     def __init__(self, key, line_no):
         """Creates a new token.  
@@ -197,17 +388,52 @@ class Token:
         """
         self.key = key
         self.func = None
+        self.folded = None
         self.line_no = line_no
 
         # Check if this is a two part expression in a format: XY variable/string
-        # (1) It would have to start with one to two letter symbol followed by at least one space
-        expression_match = re.match(r"(\w\w?)\s+[\w\W]", self.key)
+        # (1) It would have to start with one to two letter symbol followed by at least one space,
+        # (2) more functions can be chained with the `|` character, e.g., SU|TR variable/string
+        expression_match = pipeline_re.match(self.key)
         if expression_match:
-            self.func = expression_match[1]
-            self.key = self.key[len(self.func):].strip()
+            spec = expression_match[1]
+            self.key = self.key[len(spec):].strip()
 
-            if self.func not in self.funcs:
-                raise create_exception(f"Line {self.line_no}: the function `{self.func}` does not exist")
+            try:
+                steps = parse_pipeline(spec)
+            except ValueError as e:
+                raise create_exception(f"Line {self.line_no}: {e}")
+            for name, _ in steps:
+                if name not in self.funcs:
+                    raise create_exception(f"Line {self.line_no}: the function `{name}` does not exist")
+
+            # Functions can be registered again under the same name, the cache
+            # key includes the functions themselves (and whether they are pure).
+            pipeline_key = (spec, tuple((self.funcs[name], name in self.pure_funcs) for name, _ in steps))
+            if pipeline_key not in self.pipelines:
+                self.pipelines[pipeline_key] = compile_pipeline(steps, self.funcs, self.pure_funcs)
+            self.func = self.pipelines[pipeline_key]
+
+        # The `name` is the root variable name, for dotted paths, e.g., `user.address.city`,
+        # it is the first part of the path, the rest is compiled into accessors.
+        self.name = self.key
+        self.prefixes = (self.key,)
+        self.accessors = ()
+        if "." in self.key and not self.is_string_statement():
+            path = self.key.split(".")
+            for part in path[1:]:
+                if not (part.isidentifier() or part.isdigit()):
+                    raise create_exception(f"Line {self.line_no}: incorrect variable name `{self.key}`")
+            self.name = path[0]
+            self.prefixes = tuple(".".join(path[:i + 1]) for i in range(len(path)))
+            self.accessors = tuple(compile_accessor(part) for part in path[1:])
+
+        if self.func is not None and self.func.pure and self.is_string_statement():
+            # Fold pure functions of a constant string, errors are raised when rendering.
+            try:
+                self.folded = (self.render(None),)
+            except Exception:
+                pass
 
     def render(self, context):
         """Use actual values from the Template's context to render a token.
@@ -216,6 +442,9 @@ class Token:
         is a relatively simple operation. All we have to do here is to return the value of 
         `self.key` key of the `context` dictionary.
         """
+        if self.folded is not None:
+            return self.folded[0]
+
         if len(self.key) == 0:
             raise create_exception(f"Line {self.line_no}: empty token variable on line")
 
@@ -229,33 +458,104 @@ class Token:
             if q in stripped:
                 """When the variable tag contains two strings, or an incorrect string."""
                 raise create_exception(f"Line {self.line_no}: incorrect string in the variable tag")
-            return self.compute(stripped)
+            return self.compute(stripped, context)
 
-        if len(self.key) <= 2:
+        if len(self.name) <= 2:
             raise create_exception(f"Line {self.line_no}: the variable name is too short; variable names should be at leas 3 characters long")
 
-        if not self.key.isidentifier():
+        if not self.name.isidentifier():
             raise create_exception(f"Line {self.line_no}: incorrect variable name `{self.key}`")
 
-        if self.key.startswith("D") and self.key[1:] in self.defaults:
+        if self.accessors:
+            return self.compute(self.lookup(context), context)
+        return self.compute(self.resolve_name(context), context)
+
+    def resolve_name(self, context):
+        """Return the value of the root variable name, i.e., a default or a context variable."""
+        if self.name.startswith("D") and self.name[1:] in self.defaults:
             """Default variables start with the `D` prefix.
-            TODO: If there is a variable in the context dictionary under the `self.key` key then use that one.
+            TODO: If there is a variable in the context dictionary under the `self.name` key then use that one.
             """
-            return self.compute(self.defaults[self.key[1:]]())
+            return self.defaults[self.name[1:]]()
+
+        if self.name not in context:
+            raise create_exception(f"Line {self.line_no}: the variable `{self.name}` is not defined in the context dictionary", token=self, exception_class=TemplateKeyError)
 
-        if self.key not in context:
-            raise create_exception(f"Line {self.line_no}: the variable `{self.key}` is not defined in the context dictionary", token=self, exception_class=TemplateKeyError)
+        try:
+            return context[self.name]
+        except Exception as e:
+            # Only lazy values can raise here.
+            raise type(e)(f"Line {self.line_no}: (lazy value error) {e}")
 
-        return self.compute(context[self.key])
+    def lookup(self, context):
+        """Resolve a dotted variable path.
 
-    def compute(self, variable):
-        """Compute with the use of a function if specified."""
-        if self.func:
+        Starts from the longest prefix already resolved during this render (see `Context.lookups`),
+        and memoizes every prefix resolved on the way.
+        """
+        lookups = getattr(context, "lookups", None)
+        if lookups is None:
+            lookups = {}
+
+        depth = len(self.prefixes)
+        while depth > 0 and self.prefixes[depth - 1] not in lookups:
+            depth -= 1
+
+        if depth == 0:
+            value = self.resolve_name(context)
+            lookups[self.name] = value
+            depth = 1
+        else:
+            value = lookups[self.prefixes[depth - 1]]
+
+        forced = getattr(context, "forced", None)
+        for index in range(depth, len(self.prefixes)):
+            value = self.access(value, index, forced)
+            lookups[self.prefixes[index]] = value
+        return value
+
+    def access(self, value, index, forced=None):
+        """Resolve the `index`-th part of a dotted variable path (1 is the first part after the root name) on the value.
+
+        Lazy values are computed, and recorded in the `forced` dictionary under their path (if given).
+        """
+        try:
+            value = self.accessors[index - 1](value)
+        except (AttributeError, LookupError, TypeError):
+            raise create_exception(f"Line {self.line_no}: cannot resolve `{self.prefixes[index]}` of the variable `{self.key}`", token=self, exception_class=TemplateKeyError)
+        if isinstance(value, Lazy):
             try:
-                return self.funcs[self.func](variable)
+                value = value()
             except Exception as e:
-                raise type(e)(f"Line {self.line_no}: (function error, correct attribute type?) {e}")
-        return variable
+                raise type(e)(f"Line {self.line_no}: (lazy value error) {e}")
+            if forced is not None:
+                forced[self.prefixes[index]] = value
+        return value
+
+    def compute(self, variable, context=None):
+        """Compute with the use of a function if specified.
+
+        Results of pure functions are memoized in the `context` (see `Context.computed`).
+        """
+        if self.func is None:
+            return variable
+
+        computed = getattr(context, "computed", None)
+        key = None
+        # Only values that are equal exactly when they are identical are memoized, e.g.,
+        # 0.0 == -0.0 or Decimal("1") == Decimal("1.0"), yet they are displayed differently.
+        if computed is not None and self.func.pure and type(variable) in MEMOIZED_TYPES:
+            key = (self.func, type(variable), variable)
+            if key in computed:
+                return computed[key]
+
+        try:
+            value = self.func(variable)
+        except Exception as e:
+            raise type(e)(f"Line {self.line_no}: (function error, correct attribute type?) {e}")
+        if key is not None:
+            computed[key] = value
+        return value
 
     def is_string_statement(self):
         """Checks if the `self.key` contained between quotes."""
@@ -290,6 +590,7 @@ class Block:
             self.loop = True
 
         self.operand = token
+        self.line_no = line_no
         self.tokens = []
 
         # Prepare an 'if' expression.
@@ -304,13 +605,14 @@ class Block:
 
     def render(self, context):
         """Similar to the Token.render() method."""
-        if not self.conditions[0].check(context):
-            return ""
-
-        resp = ""
-        for t in self.tokens:
-            if isinstance(t, Token):
-                resp = resp + str(t.render(context))
-            else:
-                resp = resp + t
-        return resp
+        tracker = getattr(context, "tracker", None)
+        if tracker is not None:
+            tracker.enter(self)
+
+        try:
+            if not self.conditions[0].check(context):
+                return ""
+            return render_tokens(self.tokens, context)
+        finally:
+            if tracker is not None:
+                tracker.leave()
@@ -0,0 +1,81 @@
+"""
+This module provides render budgets, limits that keep a single render bounded.
+
+A Budget is passed to the Template.render() method:
+
+    >>> template.render(budget=Budget(max_output=100000, max_depth=10, timeout=0.5))
+
+Available limits (None means no limit):
+    - max_output: the maximum length of the rendered string (in characters),
+    - max_iterations: the maximum number of loop iterations in the whole render,
+    - max_depth: the maximum nesting depth of blocks,
+    - timeout: the wall-clock time (in seconds) the render can take.
+
+When a limit is exceeded, the render stops with the TemplateBudgetError exception
+that names the line of the template being rendered at that moment.
+"""
+import time
+
+from .exceptions import TemplateBudgetError
+
+
+class Budget:
+    """Limits of a single render, a Budget object can be reused by many renders."""
+
+    def __init__(self, max_output=None, max_iterations=None, max_depth=None, timeout=None):
+        self.max_output = max_output
+        self.max_iterations = max_iterations
+        self.max_depth = max_depth
+        self.timeout = timeout
+
+    def start(self):
+        """Return a new tracker for a render that starts now."""
+        return BudgetTracker(self)
+
+
+class BudgetTracker:
+    """Counts resources used by a single render and checks them against the Budget limits."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.output = 0
+        self.iterations = 0
+        self.depth = 0
+        self.deadline = None
+        if budget.timeout is not None:
+            self.deadline = time.monotonic() + budget.timeout
+        # The line of the template being rendered.
+        self.line_no = 1
+
+    def fail(self, message, token=None):
+        raise TemplateBudgetError(f"Line {self.line_no}: render budget exceeded, {message}", token=token)
+
+    def emit(self, text, token=None, literal=False):
+        """Account `text` appended to the output, also checks the deadline.
+
+        For `literal` parts of the template, `self.line_no` is the line at which `text` starts,
+        the error then names the line at which the output got too long.
+        """
+        self.output += len(text)
+        if self.budget.max_output is not None and self.output > self.budget.max_output:
+            if literal:
+                self.line_no += text.count("\n", 0, self.budget.max_output - (self.output - len(text)))
+            self.fail(f"the output is longer than {self.budget.max_output} characters", token)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.fail(f"the render took longer than {self.budget.timeout} seconds", token)
+
+    def iterate(self, token=None):
+        """Account a single loop iteration."""
+        self.iterations += 1
+        if self.budget.max_iterations is not None and self.iterations > self.budget.max_iterations:
+            self.fail(f"more than {self.budget.max_iterations} loop iterations", token)
+
+    def enter(self, block):
+        """Account entering the block."""
+        self.line_no = block.line_no
+        self.depth += 1
+        if self.budget.max_depth is not None and self.depth > self.budget.max_depth:
+            self.fail(f"blocks are nested deeper than {self.budget.max_depth} levels", block)
+
+    def leave(self):
+        self.depth -= 1
@@ -0,0 +1,198 @@
+"""
+This module provides the columnar (mail-merge) rendering mode.
+
+Instead of rendering a template once per row with one context dictionary per row,
+a parsed template is rendered against a mapping of columns, e.g.:
+
+    >>> template = Template.from_string("Hello <<SU name>>!")
+    >>> list(template.render_columns({"name": ["john", "jane"]}))
+    ['Hello JOHN!', 'Hello JANE!']
+
+Every variable tag (and its function, e.g., `SU`) is evaluated once per column, for a whole chunk
+of rows at a time, and the results are interleaved with literal segments. Literal segments and
+tags that do not depend on columns (strings, numbers, default variables) are folded together once
+per template. Columns can be any sequences supporting `len()`, indexing and slicing, e.g., lists,
+tuples or NumPy arrays; the `columns_from_csv()` function reads them from a CSV file.
+
+Only 'if' blocks are supported; their conditions are evaluated per column as well.
+"""
+import csv
+from itertools import repeat, zip_longest
+
+import tempearly.base
+from .conditions import OPERATORS
+from .context import Context
+
+
+# The number of rows rendered at once; output rows are yielded chunk by chunk.
+CHUNK_SIZE = 10000
+
+
+def columns_from_csv(file_name, **kwargs):
+    """Read a CSV file into a dictionary of columns.
+
+    The first row of the file is the header with column names. Keyword arguments are
+    passed to the `csv.reader()` function.
+    """
+    with open(file_name, newline="", encoding="utf") as fh:
+        reader = csv.reader(fh, **kwargs)
+        header = next(reader, [])
+        columns = {name: [] for name in header}
+        appends = [columns[name].append for name in header]
+        width = len(appends)
+        for row in reader:
+            for append, value in zip_longest(appends, row[:width], fillvalue=""):
+                append(value)
+    return columns
+
+
+def render_columns(tokens, columns, chunk_size=CHUNK_SIZE):
+    """Render parsed template tokens against the columns, yield one string per row.
+
+    Arguments:
+
+    `tokens` is a list of tokens, as returned by the Template.tokenize() method.
+
+    `columns` maps variable names to equally long sequences of values.
+
+    `chunk_size` is the number of rows evaluated at once.
+    """
+    names = set()
+    plans = compile_plans(tokens, columns, names)
+
+    rows = None
+    for name in names:
+        if rows is None:
+            rows = len(columns[name])
+        elif len(columns[name]) != rows:
+            raise ValueError(f"all columns must have the same length, the column `{name}` has {len(columns[name])} values, expected {rows}")
+    if rows is None:
+        # Nothing depends on columns, the number of rows is still known from the data.
+        rows = len(next(iter(columns.values()), ()))
+
+    for start in range(0, rows, chunk_size):
+        yield from render_plans(plans, columns, slice(start, min(start + chunk_size, rows)))
+
+
+def compile_plans(tokens, columns, names):
+    """Turn tokens into a list of plans: strings, `ColumnToken` and `ColumnBlock` objects.
+
+    Adjacent constant parts are joined together. Names of used columns are added to the `names` set.
+    """
+    plans = []
+    for token in tokens:
+        if isinstance(token, tempearly.base.Block):
+            plan = ColumnBlock(token, columns, names)
+        elif isinstance(token, tempearly.base.Token):
+            plan = compile_token(token, columns, names)
+            if not isinstance(plan, ColumnToken):
+                plan = str(plan)
+        else:
+            plan = str(token)
+
+        if isinstance(plan, str) and plans and isinstance(plans[-1], str):
+            plans[-1] += plan
+        else:
+            plans.append(plan)
+    return plans
+
+
+def compile_token(token, columns, names):
+    """Return a `ColumnToken` for tokens reading columns, or the computed value of a constant token."""
+    key = token.key
+    is_default = token.name.startswith("D") and token.name[1:] in token.defaults
+    if (key and not key.isdigit() and not token.is_string_statement() and not is_default
+            and len(token.name) > 2 and token.name.isidentifier() and token.name in columns):
+        names.add(token.name)
+        return ColumnToken(token)
+    # Strings, numbers and default variables do not depend on rows. The Token.render() method
+    # also raises the right exception for incorrect tags and names missing from columns.
+    return token.render(Context({}))
+
+
+def select(column, rows):
+    """Select `rows` (a slice or a list of indexes) from the column."""
+    if isinstance(rows, slice):
+        return column[rows]
+    return [column[i] for i in rows]
+
+
+def count(rows):
+    """Return the number of selected rows."""
+    if isinstance(rows, slice):
+        return rows.stop - rows.start
+    return len(rows)
+
+
+def render_plans(plans, columns, rows):
+    """Render the selected rows, return a list of strings."""
+    n = count(rows)
+    parts = []
+    for plan in plans:
+        if isinstance(plan, str):
+            parts.append(repeat(plan, n))
+        elif isinstance(plan, ColumnToken):
+            parts.append(map(str, plan.values(columns, rows)))
+        else:
+            parts.append(plan.render(columns, rows))
+    if not parts:
+        return [""] * n
+    if len(parts) == 1:
+        return list(parts[0])
+    return ["".join(row) for row in zip(*parts)]
+
+
+class ColumnToken:
+    """A variable token evaluated for many rows at once."""
+
+    def __init__(self, token):
+        self.token = token
+
+    def values(self, columns, rows):
+        """Return the list of token values for the selected rows."""
+        token = self.token
+        values = select(columns[token.name], rows)
+        for index in range(1, len(token.prefixes)):
+            values = [token.access(value, index) for value in values]
+        if token.func:
+            values = list(map(token.compute, values))
+        return values
+
+
+class ColumnBlock:
+    """An 'if' block evaluated for many rows at once.
+
+    The condition is evaluated per column, and the block contents are rendered only
+    for the rows that match it.
+    """
+
+    def __init__(self, block, columns, names):
+        if not block.condition:
+            raise tempearly.base.create_exception(f"the `{block.operand.strip()}` block is not supported in the columnar mode, only 'if' blocks are")
+        condition = block.conditions[0]
+        self.op = OPERATORS[condition.op]
+        self.a = compile_token(condition.a_tok, columns, names)
+        self.b = compile_token(condition.b_tok, columns, names)
+        self.plans = compile_plans(block.tokens, columns, names)
+
+    def operand(self, operand, columns, rows):
+        if isinstance(operand, ColumnToken):
+            return operand.values(columns, rows)
+        return repeat(operand, count(rows))
+
+    def render(self, columns, rows):
+        """Render the block for the selected rows, rows not matching the condition are empty strings."""
+        mask = map(self.op, self.operand(self.a, columns, rows), self.operand(self.b, columns, rows))
+        indexes = range(rows.start, rows.stop) if isinstance(rows, slice) else rows
+        matching = []
+        positions = []
+        for position, (index, match) in enumerate(zip(indexes, mask)):
+            if match:
+                matching.append(index)
+                positions.append(position)
+
+        output = [""] * len(indexes)
+        if matching:
+            for position, rendered in zip(positions, render_plans(self.plans, columns, matching)):
+                output[position] = rendered
+        return output
@@ -0,0 +1,73 @@
+"""
+This module provides the per-render view of a context dictionary.
+
+The Template.render() method wraps the user's context dictionary into the `Context` object
+once per render. Tokens use it to memoize lookups, so a value that is referenced many times
+in one template (or a prefix shared by many dotted paths, e.g., `user.address` in
+<<user.address.city>> and <<user.address.zip>>) is resolved only once per render.
+
+Context values can be wrapped into the `Lazy` object, e.g., {"posts": Lazy(load_posts)}. The wrapped
+zero-argument callable is called on the first reference during a render (and never if the template does
+not reference it), and its result is reused by other tokens and conditions for the rest of that render.
+Lazy values can also be nested in other values, e.g., {"user": {"posts": Lazy(load_posts)}}, and are
+computed when a dotted path (<<user.posts>>) reaches them.
+
+The wrapped dictionary is never copied nor modified.
+"""
+
+
+class Lazy:
+    """Marks a context value computed on the first reference during a render.
+
+    `calls` counts how many times the value was computed (at most once per render).
+    """
+
+    def __init__(self, func):
+        """`func` is a zero-argument callable returning the value."""
+        self.func = func
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.func()
+
+
+class Context:
+    """Per-render wrapper around the context dictionary.
+
+    Behaves like a read-only dictionary (supports `in`, `[]` and `get`), and
+    additionally stores the `lookups` cache that lives as long as a single render.
+
+    Lazy values are computed on the first access; `forced` maps names (or dotted paths, for
+    nested values) of lazy values computed during the render to their values.
+    """
+
+    def __init__(self, data, tracker=None):
+        """`data` is the context dictionary passed to the Template.
+
+        `tracker` is the BudgetTracker of the render (None when the render is not limited).
+        """
+        self.data = data
+        self.tracker = tracker
+        # Maps a resolved path (e.g., "user.address") to its value.
+        self.lookups = {}
+        self.forced = {}
+        # Maps (function chain, value type, value) to results of pure function chains
+        # (see `MEMOIZED_TYPES` in the `tempearly.base` module).
+        self.computed = {}
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __getitem__(self, key):
+        if key in self.forced:
+            return self.forced[key]
+        value = self.data[key]
+        if isinstance(value, Lazy):
+            value = self.forced[key] = value()
+        return value
+
+    def get(self, key, default=None):
+        if key in self.data:
+            return self[key]
+        return default
@@ -15,6 +15,15 @@ Default variables consist of:
     lorem
     usage: <<Dlorem>>
     Returns lorem ipsum hard-coded text.
+
+Default functions (filters) can be chained, and may take arguments, e.g.:
+    <<SU|TR|LJ20 name>> or <<LJ(20, '.') name>>
+
+(1) DY - the year of a date
+(2) SU - string upper
+(3) SL - string lower
+(4) TR - trim whitespace
+(5) LJ, RJ - left (right) justify to the width, usage: LJ20 or LJ(20, '.')
 """
 import datetime
 import os
@@ -22,28 +31,61 @@ import os
 
 DEFAULT_VARIABLE_REGISTRY = {}
 DEFAULT_FUNCTION_REGISTRY = {}
+# Names of registered functions that are pure.
+PURE_FUNCTIONS = set()
 _KEYS = set()
 
 
-def register_func(name):
-    """Register a function to use it from a template string under the `name` name."""
+def register_func(name, pure=False):
+    """Register a function to use it from a template string under the `name` name.
+
+    A `pure` function always returns the same result for the same arguments and has no
+    side effects. Such functions are computed once for constant arguments, e.g., <<SU 'text'>>,
+    and once per distinct value during a render.
+
+    The function gets the value as the first argument, followed by arguments from the template string.
+    """
     def decorator(func):
         DEFAULT_FUNCTION_REGISTRY[name] = func
+        if pure:
+            PURE_FUNCTIONS.add(name)
+        else:
+            PURE_FUNCTIONS.discard(name)
         return func
     return decorator
 
 
-@register_func("DY")
+@register_func("DY", pure=True)
 def get_date_year(date):
     """Get the year part from the date."""
     return date.year
 
 
-@register_func("SU")
+@register_func("SU", pure=True)
 def string_upper(value):
     return value.upper()
 
 
+@register_func("SL", pure=True)
+def string_lower(value):
+    return value.lower()
+
+
+@register_func("TR", pure=True)
+def string_trim(value):
+    return str(value).strip()
+
+
+@register_func("LJ", pure=True)
+def string_ljust(value, width, fillchar=" "):
+    return str(value).ljust(width, fillchar)
+
+
+@register_func("RJ", pure=True)
+def string_rjust(value, width, fillchar=" "):
+    return str(value).rjust(width, fillchar)
+
+
 class DefaultVariableMeta(type):
     """Metaclass that will register default fields."""
 
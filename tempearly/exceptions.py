@@ -11,3 +11,8 @@ class TemplateSyntaxError(TemplateError):
 
 class TemplateKeyError(TemplateError):
 	pass
+
+
+class TemplateBudgetError(TemplateError):
+	"""Raised when a render exceeds one of the limits of its Budget."""
+	pass
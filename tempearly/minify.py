@@ -0,0 +1,122 @@
+"""
+This module provides the whitespace minification pass over template tokens.
+
+The pass runs once, after a template string is tokenized (see the `minify` argument
+of the Template class), and only changes literal segments:
+    - whitespace-only lines around block tags (<% ... %>) are removed, the new line before
+      a block tag is kept (as a single space), and so is the new line after a block tag unless
+      the text before the tag already ends with whitespace, so words around block tags are not joined,
+    - other runs of whitespace are collapsed to a single space (only the ASCII whitespace of HTML,
+      non-breaking and other Unicode spaces are kept as they are),
+    - contents of <pre>, <textarea> and <script> elements are left untouched.
+
+Variable tags are never changed, hence the rendered values are emitted as they are.
+"""
+import re
+
+import tempearly.base
+
+
+PRESERVED_TAGS = ("pre", "textarea", "script")
+
+preserved_re = re.compile(r"(<(/?)({})\b[^>]*>)".format("|".join(PRESERVED_TAGS)), re.IGNORECASE)
+HTML_WHITESPACE = " \t\n\r\f"
+whitespace_re = re.compile(r"[ \t\n\r\f]+")
+# Whitespace at the beginning of a segment, up to (and including) the end of the line.
+leading_line_re = re.compile(r"^[ \t]*\r?\n")
+# Whitespace at the end of a segment, after the last new line.
+trailing_line_re = re.compile(r"(?<=\n)[ \t]+$")
+
+
+class MinifyReport:
+    """Sizes (in UTF-8 bytes) of the literal segments before and after minification."""
+
+    def __init__(self):
+        self.before = 0
+        self.after = 0
+
+    @property
+    def saved(self):
+        return self.before - self.after
+
+    def __str__(self):
+        ratio = self.saved / self.before * 100 if self.before else 0.0
+        return f"{self.before} -> {self.after} bytes (saved {self.saved} bytes, {ratio:.1f}%)"
+
+
+def minify(tokens):
+    """Minify literal segments of the token list, return a (tokens, MinifyReport) tuple.
+
+    Block objects are minified in place.
+    """
+    report = MinifyReport()
+    tokens, _, _ = minify_tokens(tokens, None, True, False, report)
+    return tokens, report
+
+
+def minify_tokens(tokens, preserved, separated, in_block, report):
+    """Minify a list of tokens, `preserved` is the name of a preserved element open before the first token.
+
+    `separated` is True when the text before the first token ends with whitespace (or there is no text).
+
+    Returns the new list of tokens, the name of a preserved element that is still open after the last token,
+    and whether the text after the last token ends with whitespace.
+    """
+    result = []
+    last = len(tokens) - 1
+    for i, token in enumerate(tokens):
+        if isinstance(token, tempearly.base.Block):
+            # The block may not be rendered, the text after it is separated only when
+            # the text both before and inside the block ends with whitespace.
+            before = separated
+            token.tokens, preserved, separated = minify_tokens(token.tokens, preserved, separated, True, report)
+            separated = separated and before
+            result.append(token)
+        elif isinstance(token, tempearly.base.Token):
+            separated = False
+            result.append(token)
+        else:
+            # A segment touches a block tag when it is the first or last one in a block,
+            # or when the previous or the next token is a block.
+            after_tag = (in_block and i == 0) or (i > 0 and isinstance(tokens[i - 1], tempearly.base.Block))
+            before_tag = (in_block and i == last) or (i < last and isinstance(tokens[i + 1], tempearly.base.Block))
+            segment, preserved = minify_segment(str(token), preserved, separated, after_tag, before_tag, report)
+            if segment:
+                separated = segment[-1] in HTML_WHITESPACE
+                result.append(tempearly.base.Literal(segment, getattr(token, "line_no", 1)))
+    return result, preserved, separated
+
+
+def minify_segment(segment, preserved, separated, after_tag, before_tag, report):
+    """Minify a single literal segment, return the new segment and the preserved element that is still open."""
+    report.before += len(segment.encode())
+
+    # Split the segment into (text, is_preserved) pieces.
+    pieces = []
+    position = 0
+    for match in preserved_re.finditer(segment):
+        closing, name = match[2], match[3].lower()
+        if preserved is None and not closing:
+            pieces.append((segment[position:match.start()], False))
+            pieces.append((match[1], True))
+            preserved = name
+            position = match.end()
+        elif preserved == name and closing:
+            pieces.append((segment[position:match.end()], True))
+            preserved = None
+            position = match.end()
+    pieces.append((segment[position:], preserved is not None))
+
+    if before_tag and not pieces[-1][1]:
+        pieces[-1] = (trailing_line_re.sub("", pieces[-1][0], count=1), False)
+    if after_tag and not pieces[0][1] and leading_line_re.match(pieces[0][0]):
+        # The block tag ends its line, drop the line end and the indentation of the next line,
+        # but keep a single space when nothing else separates the text around the block tag.
+        text = pieces[0][0].lstrip(HTML_WHITESPACE)
+        if not separated:
+            text = " " + text
+        pieces[0] = (text, False)
+
+    segment = "".join(text if raw else whitespace_re.sub(" ", text) for text, raw in pieces)
+    report.after += len(segment.encode())
+    return segment, preserved
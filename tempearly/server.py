@@ -0,0 +1,221 @@
+"""
+This module provides the render server, a long-running process with preloaded templates.
+
+Short-lived processes spend most of their time importing the package and tokenizing templates.
+The server does it once: it compiles every file of a template directory at startup, and then
+renders templates by their names (paths relative to the template directory) on request:
+
+    $ python -m tempearly serve --templates ./templates --socket /tmp/tempearly.sock
+
+    >>> with RenderClient("/tmp/tempearly.sock") as client:
+    ...     client.render("emails/welcome.html", {"name": "john"})
+
+The protocol:
+    Requests and responses are JSON objects sent over a Unix domain socket, each one prefixed
+    with its length (4 bytes, big-endian). A connection can send many requests, one after another.
+
+    request: {"template": "<name>", "context": {...}}
+    response: {"output": "<rendered template>"}
+        or, when rendering failed: {"error": "<message>", "type": "<exception class name>"}
+
+Connections are handled by asyncio, renders run in a thread pool, so a slow render does not stall
+reading and writing of other connections. Renders still share a single interpreter lock; to use
+many CPU cores, run many servers.
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import struct
+
+from .base import Template
+from .exceptions import TemplateError, TemplateKeyError
+
+
+HEADER = struct.Struct(">I")
+# Requests longer than that are rejected.
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+
+class RemoteRenderError(TemplateError):
+    """Raised by the RenderClient when the server could not render a template.
+
+    `error_type` is the name of the exception class raised on the server.
+    """
+
+    def __init__(self, msg, error_type):
+        self.error_type = error_type
+        super().__init__(msg, token=None)
+
+
+def encode_message(message):
+    """Serialize a message into the length-prefixed JSON."""
+    data = json.dumps(message).encode()
+    return HEADER.pack(len(data)) + data
+
+
+class RenderServer:
+    """Compiles all templates from the directory and renders them on request."""
+
+    def __init__(self, template_dir, minify=False, budget=None):
+        """
+        `template_dir` is the directory with template files, all files (including subdirectories) except for hidden ones are loaded
+
+        `minify` enables the whitespace minification of templates (False by default)
+
+        `budget` is a Budget object limiting every render (no limits by default)
+        """
+        self.template_dir = template_dir
+        self.minify = minify
+        self.budget = budget
+        self.templates = {}
+        # Maps names of templates that could not be loaded to error messages.
+        self.errors = {}
+
+    def load(self):
+        """Load and compile all templates, return the number of loaded templates.
+
+        Hidden files and directories (starting with a dot) are skipped. Files that are not
+        UTF-8 text or have template syntax errors are skipped as well, see `self.errors`.
+        """
+        templates = {}
+        errors = {}
+        for root, dirs, files in os.walk(self.template_dir):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for file_name in files:
+                if file_name.startswith("."):
+                    continue
+                path = os.path.join(root, file_name)
+                name = os.path.relpath(path, self.template_dir).replace(os.sep, "/")
+                try:
+                    template = Template.from_file(path, minify=self.minify)
+                    template.compile()
+                except (UnicodeDecodeError, TemplateError) as e:
+                    errors[name] = f"{type(e).__name__}: {e}"
+                    continue
+                templates[name] = template
+        self.templates = templates
+        self.errors = errors
+        return len(templates)
+
+    def render(self, request):
+        """Render a single request, return the response dictionary."""
+        try:
+            name = request["template"]
+            if name not in self.templates:
+                raise TemplateKeyError(f"the template `{name}` does not exist", token=None)
+            output = self.templates[name].render(budget=self.budget, context=request.get("context") or {})
+        except Exception as e:
+            return {"error": str(e), "type": type(e).__name__}
+        return {"output": output}
+
+    async def handle(self, reader, writer):
+        """Serve requests of a single connection until the client closes it."""
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (size,) = HEADER.unpack(header)
+                if size > MAX_MESSAGE_SIZE:
+                    writer.write(encode_message({"error": f"the request is longer than {MAX_MESSAGE_SIZE} bytes", "type": "ValueError"}))
+                    break
+
+                data = await reader.readexactly(size)
+                try:
+                    request = json.loads(data)
+                except ValueError as e:
+                    response = {"error": f"incorrect request: {e}", "type": "ValueError"}
+                else:
+                    response = await asyncio.get_running_loop().run_in_executor(None, self.render, request)
+                writer.write(encode_message(response))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, path):
+        """Start listening on the Unix socket `path`, return the asyncio server."""
+        if os.path.exists(path):
+            os.unlink(path)
+        return await asyncio.start_unix_server(self.handle, path=path)
+
+    def serve(self, path):
+        """Serve requests until interrupted (SIGINT) or terminated (SIGTERM), then remove the socket.
+
+        Templates must be loaded first (see `self.load()`).
+        """
+        async def main():
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, stop.set)
+
+            server = await self.start(path)
+            async with server:
+                await stop.wait()
+
+        try:
+            asyncio.run(main())
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+class RenderClient:
+    """A blocking client of the RenderServer, keeps a single connection open."""
+
+    def __init__(self, path, timeout=None):
+        """`path` is the server's Unix socket, `timeout` (in seconds) applies to socket operations."""
+        self.path = path
+        self.timeout = timeout
+        self.sock = None
+
+    def connect(self):
+        if self.sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self.sock = sock
+        return self.sock
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def receive(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.sock.recv(size - len(data))
+            if not chunk:
+                self.close()
+                raise ConnectionError("the render server closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def render(self, template, context=None):
+        """Render the `template` (a name relative to the server's template directory) with the context.
+
+        Raises the RemoteRenderError exception when the server could not render the template.
+        """
+        sock = self.connect()
+        sock.sendall(encode_message({"template": template, "context": context or {}}))
+        (size,) = HEADER.unpack(self.receive(HEADER.size))
+        response = json.loads(self.receive(size))
+        if "error" in response:
+            raise RemoteRenderError(response["error"], response["type"])
+        return response["output"]
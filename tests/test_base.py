@@ -3,11 +3,12 @@ Test basic templating functionality.
 """
 import datetime
 import os
+import time
 
 import pytest
 
-from tempearly import Template
-from tempearly.exceptions import TemplateKeyError, TemplateSyntaxError
+from tempearly import Budget, Lazy, Template
+from tempearly.exceptions import TemplateBudgetError, TemplateKeyError, TemplateSyntaxError
 
 
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
@@ -289,3 +290,301 @@ def test_simple_expressions():
     <<VAR>>
     <% endif %>""", {"VAR": 2})
     assert "2" in template.render()
+
+
+def test_dotted_variables():
+    """Variable names can be dotted paths that read attributes, keys and list indexes."""
+    class Address:
+        city = "Warsaw"
+
+    class User:
+        name = "john"
+        address = Address()
+        tags = ["one", "two"]
+
+    context = {"user": User(), "data": {"nested": {"key": "value"}}}
+    template_strings = [
+        ("<<user.name>>", "john"),
+        ("<<user.address.city>>", "Warsaw"),
+        ("<<user.tags.1>>", "two"),
+        ("<<data.nested.key>>", "value"),
+        ("<<SU user.name>>", "JOHN"),
+        ("<<Ddate.year>>", str(datetime.date.today().year)),
+        ("<% if user.name == 'john' %>yes<% endif %>", "yes"),
+    ]
+    for ts in template_strings:
+        template = Template.from_string(ts[0], context)
+        assert template.render() == ts[1]
+
+    # Missing attributes and keys raise the TemplateKeyError.
+    for ts in ["<<user.address.zip>>", "<<data.missing>>", "<<user.tags.5>>"]:
+        template = Template.from_string(ts, context)
+        with pytest.raises(TemplateKeyError) as e:
+            template.render()
+        assert "Line 1" in str(e)
+
+    template = Template.from_string("<<user..name>>", context)
+    with pytest.raises(TemplateSyntaxError) as e:
+        template.render()
+    assert "incorrect" in str(e)
+
+
+def test_dotted_variables_memoized():
+    """Shared prefixes of dotted paths are resolved only once per render."""
+    calls = []
+
+    class User:
+        @property
+        def address(self):
+            calls.append(1)
+            return {"city": "Warsaw", "zip": "00-001"}
+
+    template = Template.from_string("<<user.address.city>> <<user.address.zip>>", {"user": User()})
+    assert template.render() == "Warsaw 00-001"
+    assert len(calls) == 1
+
+    # The cache lives as long as a single render.
+    template.render()
+    assert len(calls) == 2
+
+
+def test_minify():
+    """Minified templates collapse whitespace in literal parts, once per template."""
+    template = Template.from_string("""<div>
+        <p>  <<VAR>>  </p>
+        <% if VAR == 1 %>
+            <span>one</span>
+        <% endif %>
+        <pre>  keep
+    this </pre><textarea>a  b</textarea>
+        <script>var a  =  1;</script>
+    </div>""", {"VAR": 1}, minify=True)
+    rendered = template.render()
+    assert rendered == "<div> <p> 1 </p> <span>one</span> <pre>  keep\n    this </pre><textarea>a  b</textarea> <script>var a  =  1;</script> </div>"
+    assert template.minify_report.saved > 0
+    # Renders reuse already compiled tokens.
+    assert template.render() == rendered
+
+    # Words around block tags are not joined.
+    template = Template.from_string("hello\n<% if 1 == 1 %>\nworld\n<% endif %>\n!", minify=True)
+    assert template.render() == "hello world !"
+
+    # Block tags right after text keep the new line after the tag as a space.
+    template_strings = [
+        ("a<% if 1 == 2 %>x<% endif %>\nb", {}, "a b"),
+        ("a<% if 1 == 2 %>x\n<% endif %>\nb", {}, "a b"),
+        ("hello<% if 1 == 1 %>\nworld<% endif %>", {}, "hello world"),
+        ("Dear <<VAR>>,<% if VAR == 1 %>\nthanks<% endif %>", {"VAR": 1}, "Dear 1, thanks"),
+        ("<% if 1 == 1 %>\nfirst<% endif %>", {}, "first"),
+    ]
+    for ts in template_strings:
+        template = Template.from_string(ts[0], ts[1], minify=True)
+        assert template.render() == ts[2], ts[0]
+
+    # Non-breaking and other Unicode spaces are kept.
+    template = Template.from_string("<td>1\xa0000\xa0\xa0zl</td>\n  <td>\u3000\u3000</td>", minify=True)
+    assert template.render() == "<td>1\xa0000\xa0\xa0zl</td> <td>\u3000\u3000</td>"
+    template = Template.from_string("a<% if 1 == 1 %>\n\xa0b<% endif %>", minify=True)
+    assert template.render() == "a \xa0b"
+
+    # The variable values are never minified.
+    template = Template.from_string("<p>\n\n<<VAR>></p>", {"VAR": "a   b"}, minify=True)
+    assert template.render() == "<p> a   b</p>"
+
+    # Real-world HTML file.
+    template = Template.from_file(os.path.join(TEMPLATE_DIR, "reddit.html"), minify=True)
+    rendered = template.render()
+    assert len(rendered) < len(template.template)
+    assert template.minify_report.saved == len(template.template.encode()) - len(rendered.encode())
+
+    assert Template.from_string("<p>\n</p>").render() == "<p>\n</p>"
+
+
+def test_lazy_variables():
+    """Lazy context values are computed on the first reference, once per render."""
+    posts = Lazy(lambda: ["first", "second"])
+    user = Lazy(lambda: {"name": "john"})
+    unused = Lazy(lambda: 1 / 0)
+    context = {"posts": posts, "user": user, "unused": unused, "VAR": 2}
+
+    template = Template.from_string(
+        "<% if user.name == 'john' %><<user.name>>: <<posts.0>>, <<posts.1>><% endif %>"
+        "<% if VAR == 1 %><<unused>><% endif %>",
+        context,
+    )
+    assert template.render() == "john: first, second"
+    assert posts.calls == 1
+    assert user.calls == 1
+    assert unused.calls == 0
+    assert template.forced == {"posts", "user"}
+
+    # Every render computes the value again.
+    template.render()
+    assert posts.calls == 2
+
+    template = Template.from_string("<<VAR>>", context)
+    template.render()
+    assert template.forced == set()
+
+    # Nested lazy values are computed once, when a dotted path reaches them.
+    posts = Lazy(lambda: {"count": 2})
+    template = Template.from_string("<<usr.posts.count>> <<usr.posts.count>>", {"usr": {"posts": posts}})
+    assert template.render() == "2 2"
+    assert posts.calls == 1
+    assert template.forced == {"usr.posts"}
+    assert list(template.render_columns({"usr": [{"posts": posts}]})) == ["2 2"]
+
+    # Errors of lazy values report the line.
+    broken = Lazy(lambda: 1 / 0)
+    for ts in ["\n<<VAR>>", "\n<<usr.posts>>"]:
+        template = Template.from_string(ts, {"VAR": broken, "usr": {"posts": broken}})
+        with pytest.raises(ZeroDivisionError) as e:
+            template.render()
+        assert "Line 2" in str(e)
+
+
+def test_nested_blocks():
+    """Blocks can contain other blocks."""
+    template = Template.from_string("<% if 1 == 1 %>a<% if VAR == 2 %>b<% endif %>c<% endif %>d", {"VAR": 2})
+    assert template.render() == "abcd"
+
+    template = Template.from_string("<% if 1 == 1 %>a<% if VAR == 2 %>b<% endif %>c<% endif %>d", {"VAR": 1})
+    assert template.render() == "acd"
+
+
+def test_render_budget():
+    """Renders exceeding the budget limits raise the TemplateBudgetError."""
+    template = Template.from_string("<p>\n<<VAR>></p>", {"VAR": "x" * 100})
+    assert template.render(budget=Budget(max_output=200))
+    with pytest.raises(TemplateBudgetError) as e:
+        template.render(budget=Budget(max_output=50))
+    assert "Line 2" in str(e)
+    assert e.value.token
+
+    # Literal parts name the line at which the output got too long.
+    template = Template.from_string("<<VAR>>\n\n\nlong long long", {"VAR": "x"})
+    with pytest.raises(TemplateBudgetError) as e:
+        template.render(budget=Budget(max_output=5))
+    assert "Line 4" in str(e)
+
+    template = Template.from_string("<% if 1 == 2 %>\n\n<% endif %>\n\nlong")
+    with pytest.raises(TemplateBudgetError) as e:
+        template.render(budget=Budget(max_output=2))
+    assert "Line 5" in str(e)
+
+    template = Template.from_string("<% if 1 == 1 %>\n<% if 1 == 1 %>\n<% if 1 == 1 %>x<% endif %><% endif %><% endif %>")
+    assert template.render(budget=Budget(max_depth=3)) == "\n\nx"
+    with pytest.raises(TemplateBudgetError) as e:
+        template.render(budget=Budget(max_depth=2))
+    assert "Line 3" in str(e)
+
+    template = Template.from_string("<<VAR>>", {"VAR": Lazy(lambda: time.sleep(0.02) or "x")})
+    with pytest.raises(TemplateBudgetError) as e:
+        template.render(budget=Budget(timeout=0.01))
+    assert "seconds" in str(e)
+
+    # A single budget can be used by many renders.
+    budget = Budget(max_iterations=2)
+    tracker = budget.start()
+    tracker.iterate()
+    tracker.iterate()
+    with pytest.raises(TemplateBudgetError):
+        tracker.iterate()
+    assert budget.start().iterations == 0
+
+
+def test_function_chains():
+    """Functions can be chained with the `|` character and take arguments."""
+    template_strings = [
+        ("<<SU|TR name>>", {"name": "  john "}, "JOHN"),
+        ("<<TR|LJ6 name>>|", {"name": " john "}, "john  |"),
+        ("<<TR|RJ(6, '.') name>>", {"name": " john "}, "..john"),
+        ("<<SL|LJ(6,'*') 'ABC'>>", {}, "abc***"),
+        ("<<DY|RJ6 Ddate>>", {}, str(datetime.date.today().year).rjust(6)),
+        ("<<SU user.name>>", {"user": {"name": "jane"}}, "JANE"),
+        ("<<LJ(6, '|') name>>", {"name": "john"}, "john||"),
+        ("<<SU|RJ(6, ')') name>>", {"name": "john"}, "))JOHN"),
+    ]
+    for ts in template_strings:
+        template = Template.from_string(ts[0], ts[1])
+        assert template.render() == ts[2]
+
+    # Unknown functions and incorrect arguments.
+    for ts in ["<<SU|XX name>>", "<<LJ(20, name>>", "<<LJ(a) name>>", "<<LJ(5, '|' name>>"]:
+        template = Template.from_string(ts, {"name": "john"})
+        with pytest.raises(TemplateSyntaxError) as e:
+            template.render()
+        assert "Line 1" in str(e)
+
+    # Function errors report the line.
+    template = Template.from_string("<<SU|DY name>>", {"name": "john"})
+    with pytest.raises(AttributeError) as e:
+        template.render()
+    assert "Line 1" in str(e)
+
+
+def test_pure_functions():
+    """Pure functions are computed once per distinct value during a render."""
+    from tempearly.base import Token
+    from tempearly.defaults import register_func, DEFAULT_FUNCTION_REGISTRY, PURE_FUNCTIONS
+
+    calls = []
+    pipelines = dict(Token.pipelines)
+
+    @register_func("QP", pure=True)
+    def pure_func(value):
+        calls.append(value)
+        return value * 2
+
+    @register_func("QI")
+    def impure_func(value):
+        calls.append(value)
+        return value * 2
+
+    try:
+        template = Template.from_string("<<QP VAR>><<QP VAR>><<QP OTHER>><<QP|SU 'a'>><<QP 'a'>>", {"VAR": "x", "OTHER": 1})
+        assert template.render() == "xxxx2AAaa"
+        # Strings are computed once, when the template is compiled.
+        assert calls == ["a", "a", "x", 1]
+        template.render()
+        assert calls == ["a", "a", "x", 1, "x", 1]
+
+        # Equal values that are displayed differently are not memoized.
+        calls.clear()
+        template = Template.from_string("<<TR|QP aaa>> <<TR|QP bbb>> <<QP ccc>> <<QP ddd>>", {"aaa": 0.0, "bbb": -0.0, "ccc": (1,), "ddd": (1.0,)})
+        assert template.render() == "0.00.0 -0.0-0.0 (1, 1) (1.0, 1.0)"
+        assert Template.from_string("<<TR aaa>> <<TR bbb>>", {"aaa": 0.0, "bbb": -0.0}).render() == "0.0 -0.0"
+
+        calls.clear()
+        template = Template.from_string("<<QI VAR>><<QI VAR>><<QI 'a'>>", {"VAR": "x"})
+        assert template.render() == "xxxxaa"
+        assert calls == ["x", "x", "a"]
+    finally:
+        del DEFAULT_FUNCTION_REGISTRY["QP"]
+        del DEFAULT_FUNCTION_REGISTRY["QI"]
+        PURE_FUNCTIONS.discard("QP")
+        Token.pipelines.clear()
+        Token.pipelines.update(pipelines)
+
+
+def test_function_registered_again():
+    """A function registered again under the same name replaces the previous one."""
+    from tempearly.base import Token
+    from tempearly.defaults import register_func, DEFAULT_FUNCTION_REGISTRY, PURE_FUNCTIONS
+
+    pipelines = dict(Token.pipelines)
+    try:
+        register_func("QZ")(lambda value: "first")
+        assert Template.from_string("<<QZ VAR>>", {"VAR": 1}).render() == "first"
+
+        del DEFAULT_FUNCTION_REGISTRY["QZ"]
+        register_func("QZ")(lambda value: "second")
+        assert Template.from_string("<<QZ VAR>>", {"VAR": 1}).render() == "second"
+        # Any callable can be registered, including built-in functions.
+        register_func("QZ", pure=True)(len)
+        assert Template.from_string("<<QZ VAR>> <<QZ VAR>>", {"VAR": "abc"}).render() == "3 3"
+    finally:
+        DEFAULT_FUNCTION_REGISTRY.pop("QZ", None)
+        PURE_FUNCTIONS.discard("QZ")
+        Token.pipelines.clear()
+        Token.pipelines.update(pipelines)
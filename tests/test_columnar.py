@@ -0,0 +1,73 @@
+"""
+Test the columnar rendering mode.
+"""
+import datetime
+
+import pytest
+
+from tempearly import Template
+from tempearly.columnar import columns_from_csv
+from tempearly.exceptions import TemplateKeyError, TemplateSyntaxError
+
+
+def test_render_columns():
+    """Every row should render the same as with a per-row context dictionary."""
+    columns = {
+        "name": ["john", "jane", "joe"],
+        "age": [1, 2, 3],
+        "data": [{"city": "A"}, {"city": "B"}, {"city": "C"}],
+    }
+    template_strings = [
+        "<p><<name>></p>",
+        "<<SU name>> is <<age>> in <<data.city>>",
+        "<<'x'>><<12>><<name>>",
+        "<<DY Ddate>> <<name>>",
+        "no tags",
+        "<% if age == 2 %>two: <<name>><% endif %>|<<name>>",
+        "<% if name == 'joe' %><<SU name>><% endif %>",
+    ]
+    for ts in template_strings:
+        expected = [
+            Template.from_string(ts, {name: values[i] for name, values in columns.items()}).render()
+            for i in range(3)
+        ]
+        for chunk_size in (1, 2, 10):
+            rendered = list(Template.from_string(ts).render_columns(columns, chunk_size=chunk_size))
+            assert rendered == expected, ts
+
+    assert list(Template.from_string("<<Ddate>>").render_columns(columns))[0] == str(datetime.date.today())
+
+
+def test_render_columns_errors():
+    """Errors should match the ones raised by Template.render()."""
+    with pytest.raises(TemplateKeyError):
+        list(Template.from_string("<<missing>>").render_columns({"name": ["a"]}))
+
+    with pytest.raises(TemplateSyntaxError):
+        list(Template.from_string("<<ab>>").render_columns({"ab": ["a"]}))
+
+    with pytest.raises(AttributeError) as e:
+        list(Template.from_string("<<DY name>>").render_columns({"name": ["a"]}))
+    assert "Line 1" in str(e)
+
+    # Functions are not applied to rows excluded by the condition.
+    template = Template.from_string("<% if kind == 'date' %><<DY value>><% endif %>")
+    rendered = list(template.render_columns({
+        "kind": ["date", "text"],
+        "value": [datetime.date(2020, 1, 1), "text"],
+    }))
+    assert rendered == ["2020", ""]
+
+    with pytest.raises(ValueError):
+        list(Template.from_string("<<name>><<age>>").render_columns({"name": ["a"], "age": [1, 2]}))
+
+
+def test_columns_from_csv(tmp_path):
+    """CSV files are read into a dictionary of columns."""
+    path = tmp_path / "data.csv"
+    path.write_text("name,city\njohn,A\njane\n", encoding="utf")
+    columns = columns_from_csv(path)
+    assert columns == {"name": ["john", "jane"], "city": ["A", ""]}
+
+    rendered = list(Template.from_string("<<name>>:<<city>>").render_columns(columns))
+    assert rendered == ["john:A", "jane:"]
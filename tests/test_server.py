@@ -0,0 +1,96 @@
+"""
+Test the render server and its client.
+"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from tempearly.budget import Budget
+from tempearly.server import RemoteRenderError, RenderClient, RenderServer
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Run the render server in a background thread, return its socket path."""
+    path = str(tmp_path / "tempearly.sock")
+    server = RenderServer(TEMPLATE_DIR, budget=Budget(max_output=1000000))
+    assert server.load() == 2
+
+    loop = asyncio.new_event_loop()
+    started = threading.Event()
+
+    async def main():
+        await server.start(path)
+        started.set()
+
+    thread = threading.Thread(target=lambda: (loop.run_until_complete(main()), loop.run_forever()), daemon=True)
+    thread.start()
+    started.wait(5)
+    yield path
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+
+
+def test_render(socket_path):
+    """Templates are rendered by their names, many requests can use one connection."""
+    with open(os.path.join(TEMPLATE_DIR, "reddit.html"), encoding="utf") as fh:
+        contents = fh.read()
+
+    with RenderClient(socket_path, timeout=5) as client:
+        assert client.render("reddit.html") == contents
+        assert "<title>Hello, today is" in client.render("variable_date.html", {"unused": 1})
+        assert client.render("reddit.html") == contents
+
+
+def test_concurrent_connections(socket_path):
+    """Requests of many connections are served at the same time."""
+    barrier = threading.Barrier(4)
+    results = []
+
+    def render():
+        with RenderClient(socket_path, timeout=5) as client:
+            client.connect()
+            barrier.wait(5)
+            for _ in range(5):
+                results.append(client.render("reddit.html"))
+
+    threads = [threading.Thread(target=render) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert len(results) == 20
+    assert len(set(results)) == 1
+
+
+def test_render_errors(socket_path):
+    """Errors are sent back to the client, the connection stays usable."""
+    with RenderClient(socket_path, timeout=5) as client:
+        with pytest.raises(RemoteRenderError) as e:
+            client.render("missing.html")
+        assert e.value.error_type == "TemplateKeyError"
+        assert str(e.value) == "the template `missing.html` does not exist"
+
+        assert client.render("variable_date.html")
+
+
+def test_load_skips_broken_files(tmp_path):
+    """Hidden files, binary files and templates with syntax errors do not stop the server."""
+    (tmp_path / "good.html").write_text("<p><<VAR>></p>", encoding="utf")
+    (tmp_path / "broken.html").write_text("<p><<VAR</p>", encoding="utf")
+    (tmp_path / "binary.bin").write_bytes(b"\xff\xfe\x00")
+    (tmp_path / ".DS_Store").write_bytes(b"\xff\xfe\x00")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "HEAD").write_text("ref", encoding="utf")
+
+    server = RenderServer(str(tmp_path))
+    assert server.load() == 1
+    assert list(server.templates) == ["good.html"]
+    assert set(server.errors) == {"broken.html", "binary.bin"}
+    assert "TemplateSyntaxError" in server.errors["broken.html"]
+    assert server.render({"template": "good.html", "context": {"VAR": 1}}) == {"output": "<p>1</p>"}